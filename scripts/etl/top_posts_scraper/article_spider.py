@@ -116,8 +116,13 @@ class ArticleSpider(scrapy.Spider):
             response.meta['d']['comments'] = chr(28).join(response.meta['comments'])
             line = '\t'.join(list(response.meta['d'].values())) + "\n"
             response.meta['w'].write(line)
+            self.on_article_written(response.meta)
             # print(line)
 
+    def on_article_written(self, meta):
+        """게시글 한 줄이 파일에 기록된 뒤 호출된다. 필요한 spider에서 재정의한다."""
+        pass
+
     def parse_content(self, string):
         string = html.unescape(html.unescape(string))
         string = re.sub('\[\[\[CONTENT-ELEMENT-\d+\]\]\]', '', string)
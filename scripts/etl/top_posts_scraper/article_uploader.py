@@ -1,5 +1,6 @@
 import os
-from database_setup import db, Article, CertificateReview, BeautyPromoPost, OliveYoungReview
+from database_setup import db, Article, CertificateReview, BeautyPromoPost, OliveYoungReview, RecordKeyword
+from keyword_index import index_record
 
 MODEL_MAP = {
     'articles': Article,
@@ -8,8 +9,102 @@ MODEL_MAP = {
     'olive_young_reviews': OliveYoungReview,
 }
 
-
-def upload_file_to_table(file_path: str, table_name: str):
+# 프롬프트에 들어갈 발췌본의 토큰 예산 (edge function이 원문 대신 이 값을 사용)
+CONTENT_TOKEN_BUDGET = 1500
+COMMENTS_TOKEN_BUDGET = 500
+
+COMMENT_PREFIX = '\n댓글: '
+
+
+def estimate_token_count(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 근사한다.
+    한글 등 비ASCII 문자는 글자당 1토큰, ASCII 문자는 4글자당 1토큰으로 계산한다.
+    (UTF-8에서 한글은 3바이트이므로 바이트 길이 차이로 글자 수를 구한다.)
+    """
+    if not text:
+        return 0
+    wide = (len(text.encode('utf-8')) - len(text)) // 2
+    return wide + -(-(len(text) - wide) // 4)
+
+
+def truncate_to_token_budget(text: str, budget: int) -> str:
+    tokens = estimate_token_count(text)
+    if tokens <= budget:
+        return text
+
+    # 앞부분이 길어질수록 토큰 수도 늘어나므로, 예산 안에 드는 가장 긴 앞부분을 이분 탐색으로 찾는다.
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_token_count(text[:mid]) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    excerpt = text[:low]
+
+    # 단어 중간에서 잘리지 않도록 가까운 공백까지만 되돌린다.
+    space = excerpt.rfind(' ')
+    if space != -1 and space > low - 10:
+        excerpt = excerpt[:space]
+    return excerpt
+
+
+def format_comments(comment_list) -> str:
+    return COMMENT_PREFIX + COMMENT_PREFIX.join(comment_list)
+
+
+def parse_comments(comments: str) -> list:
+    """format_comments로 저장된 문자열을 다시 댓글 목록으로 나눈다."""
+    return [c for c in (comments or '').split(COMMENT_PREFIX) if c]
+
+
+def build_comments_excerpt(comment_list, budget: int) -> str:
+    """
+    예산 안에 들어오는 앞쪽 댓글만 모은다.
+    첫 댓글부터 예산을 넘으면 예시 댓글이 비지 않도록 첫 댓글을 잘라서 넣는다.
+    """
+    prefix_tokens = estimate_token_count(COMMENT_PREFIX)
+    selected = []
+    used = 0
+    for comment in comment_list:
+        used += prefix_tokens + estimate_token_count(comment)
+        if used > budget:
+            break
+        selected.append(comment)
+
+    if not selected and comment_list:
+        selected.append(truncate_to_token_budget(comment_list[0], budget - prefix_tokens))
+    return format_comments(selected)
+
+
+def build_prompt_fields(title: str, content: str, comment_list, content_token_budget: int = CONTENT_TOKEN_BUDGET, comments_token_budget: int = COMMENTS_TOKEN_BUDGET) -> dict:
+    """프롬프트용 파생 컬럼(token_count, comment_count, content_excerpt, comments_excerpt)을 만든다."""
+    return dict(
+        token_count=estimate_token_count(title) + estimate_token_count(content) + estimate_token_count(format_comments(comment_list)),
+        comment_count=len(comment_list),
+        content_excerpt=truncate_to_token_budget(content, content_token_budget),
+        comments_excerpt=build_comments_excerpt(comment_list, comments_token_budget),
+    )
+
+
+def build_row(cols, content_token_budget: int = CONTENT_TOKEN_BUDGET, comments_token_budget: int = COMMENTS_TOKEN_BUDGET) -> dict:
+    """TSV 한 줄의 컬럼으로 insert할 값과 프롬프트용 파생 컬럼을 만든다."""
+    title = cols[6]
+    content = cols[7]
+    comment_list = [c for c in cols[8].split(chr(28)) if c]
+    comments = format_comments(comment_list)
+
+    return dict(
+        url=cols[10].strip(),
+        title=title,
+        content=content,
+        comments=comments,
+        **build_prompt_fields(title, content, comment_list, content_token_budget, comments_token_budget),
+    )
+
+
+def upload_file_to_table(file_path: str, table_name: str, content_token_budget: int = CONTENT_TOKEN_BUDGET, comments_token_budget: int = COMMENTS_TOKEN_BUDGET):
     if not file_path or not table_name:
         print("❌ 오류: 'file_to_upload'와 'target_table' 변수 값을 설정해야 합니다.")
         return
@@ -26,7 +121,7 @@ def upload_file_to_table(file_path: str, table_name: str):
 
     try:
         db.connect()
-        db.create_tables([TargetModel], safe=True)
+        db.create_tables([TargetModel, RecordKeyword], safe=True)
         print(f"✅ 데이터베이스 연결 및 '{table_name}' 테이블 확인 완료.")
     except Exception as e:
         print(f"❌ 데이터베이스 연결에 실패했습니다: {e}")
@@ -44,20 +139,18 @@ def upload_file_to_table(file_path: str, table_name: str):
                     print(f"  - 경고: {i}번째 라인에 컬럼이 부족하여 건너뜁니다.")
                     continue
 
-                url = cols[10].strip()
-                title = cols[6]
-                content = cols[7]
-                comments = '\n댓글: ' + '\n댓글: '.join(cols[8].split(chr(28)))
-
-                TargetModel.insert(
-                    url=url,
-                    title=title,
-                    content=content,
-                    comments=comments
-                ).on_conflict(
+                row = build_row(cols, content_token_budget, comments_token_budget)
+
+                # 같은 url이 다시 들어오면(댓글 수가 바뀌어 다시 수집된 게시글 등) 최신 내용으로 덮어쓴다.
+                # 파일 안에 같은 url이 여러 줄 있으면 마지막 줄이 남는다.
+                record_id = TargetModel.insert(**row).on_conflict(
                     conflict_target=(TargetModel.url,),
-                    action='ignore'
+                    preserve=[TargetModel.title, TargetModel.content, TargetModel.comments,
+                              TargetModel.token_count, TargetModel.comment_count,
+                              TargetModel.content_excerpt, TargetModel.comments_excerpt]
                 ).execute()
+
+                index_record(table_name, record_id, cols[6], cols[7], cols[8])
                 processed_lines += 1
 
         print(f"✨ '{file_name}' 파일 처리 완료. ({processed_lines} 라인 -> '{table_name}' 테이블)")
@@ -69,6 +162,50 @@ def upload_file_to_table(file_path: str, table_name: str):
         print("\n🎉 작업 완료! 데이터베이스 연결을 종료합니다.")
 
 
+def backfill_prompt_fields(table_name: str, content_token_budget: int = CONTENT_TOKEN_BUDGET, comments_token_budget: int = COMMENTS_TOKEN_BUDGET, batch_size: int = 1000):
+    """파생 컬럼이 추가되기 전에 업로드된 레코드(content_excerpt IS NULL)의 파생 컬럼을 채운다."""
+    TargetModel = MODEL_MAP.get(table_name)
+    if not TargetModel:
+        valid_tables = ", ".join(f"'{k}'" for k in MODEL_MAP.keys())
+        print(f"❌ 오류: 지원되지 않는 테이블명입니다 -> '{table_name}'. {valid_tables}를 사용하세요.")
+        return
+
+    try:
+        db.connect()
+    except Exception as e:
+        print(f"❌ 데이터베이스 연결에 실패했습니다: {e}")
+        return
+
+    print(f"\n🔄 '{table_name}' 테이블 파생 컬럼 채우기 시작...")
+    try:
+        last_id = 0
+        updated = 0
+        while True:
+            records = list(TargetModel
+                           .select(TargetModel.id, TargetModel.title, TargetModel.content, TargetModel.comments)
+                           .where((TargetModel.id > last_id) & TargetModel.content_excerpt.is_null())
+                           .order_by(TargetModel.id)
+                           .limit(batch_size))
+            if not records:
+                break
+
+            with db.atomic():
+                for record in records:
+                    fields = build_prompt_fields(record.title or '', record.content or '', parse_comments(record.comments),
+                                                 content_token_budget, comments_token_budget)
+                    TargetModel.update(**fields).where(TargetModel.id == record.id).execute()
+            last_id = records[-1].id
+            updated += len(records)
+            print(f"  - {updated} 레코드 완료 (마지막 id: {last_id})")
+
+        print(f"✨ '{table_name}' 테이블 파생 컬럼 채우기 완료. ({updated} 레코드)")
+
+    except Exception as e:
+        print(f"❌ '{table_name}' 테이블 처리 중 오류가 발생했습니다: {e}")
+    finally:
+        db.close()
+
+
 if __name__ == '__main__':
     # ▼▼▼ 실행 전, 업로드할 파일 경로와 테이블명을 여기에 직접 입력하세요. ▼▼▼
 
@@ -78,4 +215,7 @@ if __name__ == '__main__':
 
     # ▲▲▲ 수정 후 파일을 저장하고 스크립트를 실행하세요. ▲▲▲
 
-    upload_file_to_table(file_to_upload, target_table)
\ No newline at end of file
+    upload_file_to_table(file_to_upload, target_table)
+
+    # 파생 컬럼이 없는 기존 레코드를 채우려면 아래를 실행하세요.
+    # backfill_prompt_fields(target_table)
\ No newline at end of file
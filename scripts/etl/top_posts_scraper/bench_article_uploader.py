@@ -0,0 +1,74 @@
+import os
+import random
+import tempfile
+import time
+
+from article_uploader import build_row
+
+"""
+업로드 시점에 파생 컬럼(token_count, comment_count, content_excerpt, comments_excerpt)을
+계산하는 비용을 측정한다. DB insert는 제외하고 TSV 파싱 비용만 비교한다.
+
+실행: python bench_article_uploader.py
+"""
+
+ROW_COUNT = 100_000
+SYLLABLES = '가나다라마바사아자차카타파하뷰티자격증합격후기올리브영'
+
+
+def make_word_pool(rng, size=5000):
+    pool = []
+    for _ in range(size):
+        if rng.random() < 0.2:
+            pool.append('abc' * rng.randint(1, 3))
+        else:
+            pool.append(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 5))))
+    return pool
+
+
+def make_text(rng, pool, min_words, max_words):
+    return ' '.join(rng.choices(pool, k=rng.randint(min_words, max_words)))
+
+
+def make_tsv(file_path, row_count):
+    rng = random.Random(0)
+    pool = make_word_pool(rng)
+    with open(file_path, 'w', encoding='utf-8') as w:
+        for i in range(row_count):
+            comments = chr(28).join(make_text(rng, pool, 3, 20) for _ in range(rng.randint(0, 30)))
+            row = [str(i), '1', '카페', '게시판', 'user', '10',
+                   make_text(rng, pool, 3, 10), make_text(rng, pool, 50, 800), comments, '2025-01-01',
+                   f'https://cafe.naver.com/bench/{i}']
+            w.write('\t'.join(row) + '\n')
+
+
+def build_row_baseline(cols):
+    return dict(
+        url=cols[10].strip(),
+        title=cols[6],
+        content=cols[7],
+        comments='\n댓글: ' + '\n댓글: '.join(cols[8].split(chr(28))),
+    )
+
+
+def run(file_path, fn):
+    start = time.perf_counter()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            fn(line.strip().split('\t'))
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'bench.tsv')
+        make_tsv(file_path, ROW_COUNT)
+        size_mb = os.path.getsize(file_path) / 1024 / 1024
+
+        baseline = run(file_path, build_row_baseline)
+        derived = run(file_path, build_row)
+
+    print(f"rows: {ROW_COUNT:,} ({size_mb:.1f} MB)")
+    print(f"baseline : {baseline:.2f}s ({baseline / ROW_COUNT * 1e6:.1f} us/row)")
+    print(f"derived  : {derived:.2f}s ({derived / ROW_COUNT * 1e6:.1f} us/row)")
+    print(f"overhead : {derived - baseline:.2f}s (+{(derived - baseline) / ROW_COUNT * 1e6:.1f} us/row)")
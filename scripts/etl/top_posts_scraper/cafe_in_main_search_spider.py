@@ -17,6 +17,7 @@ import sys
 
 sys.path.append((pathlib.Path(__file__).parent.parent / 'common').as_posix())
 from article_spider import ArticleSpider
+from club_id_cache import ClubIdCache
 
 """
 이 파일은 통합검색의 옵션 메뉴를 활용하여 특정 날짜를 지정하면 그 날 부터 1일씩 추가하면서
@@ -43,6 +44,7 @@ class CafeSearchSpider(ArticleSpider):
         self.base_url = "https://s.search.naver.com/p/cafe/48/search.naver?abt=&ac=1&aq=0&cafe_where=articleg&date_from={}&date_option=8&date_to={}&display=30&m=0&nlu_query=&nx_and_query=&nx_search_query=&nx_sub_query=&prdtype=0&prmore=1&qdt=1&query={}&qvt=1&spq=0&ssc=tab.cafe.all&st=rel&start={}&stnm=date"
         self.api_base_url = 'https://apis.naver.com/cafe-web/cafe-articleapi/v3/cafes/{}/articles/{}'
         self.cnt = ""
+        self.club_id_cache = ClubIdCache(pathlib.Path(__file__).parent / 'data' / 'cafe_club_id_cache.json')
 
         # settings
         self.keywords = ['뷰티자격증합격']
@@ -79,8 +81,14 @@ class CafeSearchSpider(ArticleSpider):
                 self.cnt += 1
 
                 url_obj = urlparse(link)
+                # 이미 숫자 카페 id를 알고 있으면 카페 페이지를 거치지 않고 바로 API를 호출한다.
+                cafe_id_num = self.club_id_cache.get(cafe_id)
+                if cafe_id_num:
+                    yield self.create_article_request(cafe_id_num, article_id, url_obj.query, response.meta['w'])
+                    continue
+
                 url = f"https://cafe.naver.com/{cafe_id}/{article_id}?{url_obj.query}"
-                yield scrapy.Request(url=url, callback=self.parse_cafe_article, meta={'article_id': article_id, 'w': response.meta['w']})
+                yield scrapy.Request(url=url, callback=self.parse_cafe_article, meta={'article_id': article_id, 'w': response.meta['w'], 'cafe_slug': cafe_id})
 
         if self.cnt == 0 or response.meta['page'] > 3:
             return
@@ -99,18 +107,21 @@ class CafeSearchSpider(ArticleSpider):
             cafe_id = url_obj.path.split('/')[1]
             article_id = url_obj.path.split('/')[2]
             url = f"https://cafe.naver.com/{cafe_id}/{article_id}?{url_obj.query}"
-            yield scrapy.Request(url=url, callback=self.parse_cafe_article, meta={'article_id': article_id, 'w': response.meta['w']}, dont_filter=True)
+            yield scrapy.Request(url=url, callback=self.parse_cafe_article, meta={'article_id': article_id, 'w': response.meta['w'], 'cafe_slug': response.meta['cafe_slug']}, dont_filter=True)
             return
         try:
             cafe_id_num = re.search('g_sClubId = \"\d+\"', response.text).group().split('"')[1]
-            url = self.api_base_url.format(cafe_id_num, response.meta['article_id'])
-            art_key = urlparse(response.url).query
-            added_query_url = f"{url}?{urlparse(response.url).query}"
-            meta = dict(cafe_id=cafe_id_num, article_id=response.meta['article_id'], w=response.meta['w'], art_key=art_key)
-            yield scrapy.Request(url=added_query_url, callback=self.parse_article, meta=meta)
+            # 리다이렉트로 주소 형태가 바뀔 수 있으므로 조회할 때 쓰는 검색 결과의 slug로 저장한다.
+            self.club_id_cache.set(response.meta['cafe_slug'], cafe_id_num)
+            yield self.create_article_request(cafe_id_num, response.meta['article_id'], url_obj.query, response.meta['w'])
         except Exception as e:
             print(e)
 
+    def create_article_request(self, cafe_id_num, article_id, art_key, w):
+        url = f"{self.api_base_url.format(cafe_id_num, article_id)}?{art_key}"
+        meta = dict(cafe_id=cafe_id_num, article_id=article_id, w=w, art_key=art_key)
+        return scrapy.Request(url=url, callback=self.parse_article, meta=meta)
+
     def get_date_string_pair(self, days):
         date = []
         t = datetime(2024,1, 1)
@@ -127,6 +138,10 @@ class CafeSearchSpider(ArticleSpider):
                 date.append((t1.strftime("%Y%m%d"), t2.strftime("%Y%m%d")))
         return date
 
+    def close(self, reason):
+        print(f"club id cache | hit: {self.club_id_cache.hits} | miss: {self.club_id_cache.misses}")
+        self.club_id_cache.save()
+
 
 if __name__ == '__main__':
     s = get_project_settings()
@@ -34,34 +34,75 @@ from article_spider import ArticleSpider
 class CafePopularArticleSpider(ArticleSpider):
     name = "spider"
 
-    def __init__(self, cafe_id):
+    def __init__(self, cafe_ids):
         super().__init__()
-        self.cafe_id = cafe_id
-        self.cafe_nick = None
-        self.popular_article_url = f"https://apis.naver.com/cafe-web/cafe2/WeeklyPopularArticleListV3.json?cafeId={self.cafe_id}&mobileWeb=true&adUnit=PC_CAFE_BOARD&ad=false"
-        self.w = None
+        # 카페 하나만 넘겨도 동작하도록 리스트로 맞춘다. (스냅샷 json의 키와 맞추기 위해 문자열로 저장)
+        if isinstance(cafe_ids, (str, int)):
+            cafe_ids = [cafe_ids]
+        self.cafe_ids = [str(cafe_id) for cafe_id in cafe_ids]
+        self.popular_article_url = "https://apis.naver.com/cafe-web/cafe2/WeeklyPopularArticleListV3.json?cafeId={}&mobileWeb=true&adUnit=PC_CAFE_BOARD&ad=false"
+        self.snapshot_path = pathlib.Path(__file__).parent / 'data' / 'cafe_popular_snapshot.json'
+        self.snapshot = self.load_snapshot()
+        self.writers = dict()
+
+    def load_snapshot(self):
+        """카페별 {article_id: comment_count} 스냅샷. 지난 실행에서 기록된 게시글만 들어 있다."""
+        if not self.snapshot_path.exists():
+            return dict()
+        with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_snapshot(self):
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot, f, ensure_ascii=False, indent=2)
+
+    def get_writer(self, cafe_nick):
+        if cafe_nick not in self.writers:
+            file_path = (pathlib.Path(__file__).parent / 'data' / f'cafe_{cafe_nick}_unprocessed.tsv').as_posix()
+            self.writers[cafe_nick] = open(file_path, 'a', encoding="utf-8")
+        return self.writers[cafe_nick]
 
     def start_requests(self):
-        yield scrapy.Request(url=self.popular_article_url, callback=self.parse)
+        for cafe_id in self.cafe_ids:
+            url = self.popular_article_url.format(cafe_id)
+            yield scrapy.Request(url=url, callback=self.parse, meta=dict(cafe_id=cafe_id))
 
     def parse(self, response, **kwargs):
         json_data = json.loads(response.xpath('/html/body/pre/text()').get())
+        result = json_data['message']['result']
+
+        cafe_id = response.meta['cafe_id']
+        cafe_nick = result['cafeUrl']
+        previous = self.snapshot.get(cafe_id, dict())
+
+        # 목록에서 빠진 게시글은 스냅샷에서도 지운다. 새로 받을 게시글은 기록된 뒤에 추가된다.
+        current = dict()
+        changed = list()
+        for article_info in result['articleList']:
+            article_id = str(article_info['articleId'])
+            comment_count = article_info.get('commentCount', 0)
+            if previous.get(article_id) == comment_count:
+                current[article_id] = comment_count
+            else:
+                changed.append((article_info, comment_count))
+        self.snapshot[cafe_id] = current
 
-        self.cafe_nick = json_data['message']['result']['cafeUrl']
-
-        file_path = (pathlib.Path(__file__).parent / 'data' / f'cafe_{self.cafe_nick}_unprocessed.tsv').as_posix()
-        self.w = open(file_path, 'w', encoding="utf-8")
-        response.meta['w'] = self.w
+        print(f"cafe: {cafe_nick}({cafe_id}) | 목록 {len(result['articleList'])}건 중 {len(changed)}건 변경")
 
-        for article_info in json_data['message']['result']['articleList']:
+        w = self.get_writer(cafe_nick)
+        for article_info, comment_count in changed:
             subject = article_info['subject']
             article_id = article_info['articleId']
 
-            print(f"subject: {subject} | https://cafe.naver.com/ca-fe/cafes/{self.cafe_id}/articles/{article_id}?fromPopular=true")
-            meta = dict(cafe_id=self.cafe_id, article_id=article_id, w=response.meta['w'])
-            url = self.popular_article_api_base_url.format(self.cafe_id, article_id)
+            print(f"subject: {subject} | https://cafe.naver.com/ca-fe/cafes/{cafe_id}/articles/{article_id}?fromPopular=true")
+            meta = dict(cafe_id=cafe_id, article_id=article_id, w=w, comment_count=comment_count)
+            url = self.popular_article_api_base_url.format(cafe_id, article_id)
             yield scrapy.Request(url=url, callback=self.parse_article, meta=meta)
 
+    def on_article_written(self, meta):
+        self.snapshot[meta['cafe_id']][str(meta['article_id'])] = meta['comment_count']
+
     def parse_cafe_article(self, response, **kwargs):
         url_obj = urlparse(response.url)
         if url_obj.hostname == 'm.cafe.naver.com':
@@ -97,15 +138,18 @@ class CafePopularArticleSpider(ArticleSpider):
         return date
 
     def close(self, reason):
-        self.w.close()
+        for w in self.writers.values():
+            w.close()
+        self.save_snapshot()
 
 
-def run_spider(cafe_id):
+def run_spider(cafe_ids):
     process = CrawlerProcess()
-    process.crawl(CafePopularArticleSpider, cafe_id)
+    process.crawl(CafePopularArticleSpider, cafe_ids)
     process.start()
 
 
 if __name__ == '__main__':
-    cafe_id = "15101779"
-    run_spider(cafe_id)
+    # 매일 확인할 카페 id 목록. 지난 실행 이후 새로 올라왔거나 댓글 수가 바뀐 게시글만 수집한다.
+    cafe_ids = ["15101779"]
+    run_spider(cafe_ids)
@@ -0,0 +1,64 @@
+import json
+import pathlib
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+"""
+카페 주소(slug, 예: 'cafe.naver.com/{slug}/{article_id}') -> 숫자 카페 id(g_sClubId) 캐시.
+
+카페 HTML 페이지를 받아 g_sClubId를 찾는 과정을 건너뛰기 위해 사용한다.
+파일에 저장해 두고 다음 실행 때 다시 읽으므로 지난 실행에서 찾은 카페는 바로 API를 호출할 수 있다.
+- ttl이 지난 항목은 버리고 다시 HTML에서 찾는다.
+- max_size를 넘으면 가장 오래 사용하지 않은 항목부터 버린다. (LRU)
+"""
+
+
+class ClubIdCache:
+    def __init__(self, path, ttl=timedelta(days=30), max_size=10000):
+        self.path = pathlib.Path(path)
+        self.ttl = ttl.total_seconds()
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        now = time.time()
+        for slug, (club_id, saved_at) in data.items():
+            if now - saved_at < self.ttl:
+                self.entries[slug] = (club_id, saved_at)
+        self.trim()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+
+    def get(self, slug):
+        slug = slug.lower()
+        entry = self.entries.get(slug)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            self.entries.pop(slug, None)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(slug)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, slug, club_id):
+        slug = slug.lower()
+        self.entries[slug] = (str(club_id), time.time())
+        self.entries.move_to_end(slug)
+        self.trim()
+
+    def trim(self):
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
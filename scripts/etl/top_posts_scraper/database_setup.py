@@ -17,6 +17,10 @@ class Article(BaseModel):
     title = TextField()
     content = TextField()
     comments = TextField()
+    token_count = IntegerField(null=True)
+    comment_count = IntegerField(null=True)
+    content_excerpt = TextField(null=True)
+    comments_excerpt = TextField(null=True)
 
     class Meta:
         table_name = 'articles'
@@ -26,6 +30,10 @@ class CertificateReview(BaseModel):
     title = TextField()
     content = TextField()
     comments = TextField()
+    token_count = IntegerField(null=True)
+    comment_count = IntegerField(null=True)
+    content_excerpt = TextField(null=True)
+    comments_excerpt = TextField(null=True)
 
     class Meta:
         table_name = 'certificate_reviews'
@@ -35,6 +43,10 @@ class BeautyPromoPost(BaseModel):
     title = TextField()
     content = TextField()
     comments = TextField()
+    token_count = IntegerField(null=True)
+    comment_count = IntegerField(null=True)
+    content_excerpt = TextField(null=True)
+    comments_excerpt = TextField(null=True)
 
     class Meta:
         table_name = 'beauty_promo_posts'
@@ -44,6 +56,20 @@ class OliveYoungReview(BaseModel):
     title = TextField()
     content = TextField()
     comments = TextField()
+    token_count = IntegerField(null=True)
+    comment_count = IntegerField(null=True)
+    content_excerpt = TextField(null=True)
+    comments_excerpt = TextField(null=True)
 
     class Meta:
-        table_name = 'olive_young_reviews'
\ No newline at end of file
+        table_name = 'olive_young_reviews'
+
+
+class RecordKeyword(BaseModel):
+    table_identifier = TextField()
+    term = TextField()
+    record_id = BigIntegerField()
+
+    class Meta:
+        table_name = 'record_keywords'
+        primary_key = CompositeKey('table_identifier', 'term', 'record_id')
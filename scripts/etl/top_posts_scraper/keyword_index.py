@@ -0,0 +1,105 @@
+import re
+from peewee import fn
+from database_setup import db, RecordKeyword
+
+"""
+title/content/comments에서 추출한 단어 -> 레코드 id 역색인(record_keywords)을 관리한다.
+
+- 업로드 시 article_uploader가 index_record로 새 레코드를 바로 색인한다.
+- 기존 테이블은 build_keyword_index로 아직 색인되지 않은 레코드만 이어서 색인한다.
+- 조회는 DB 함수 get_next_matching_record가 담당하며, 키워드별로 마지막 사용 id를 추적한다.
+
+한국어는 조사가 붙으므로('올리브영에서') 단어마다 길이 MIN_TERM_LENGTH~MAX_TERM_LENGTH의
+접두어를 모두 색인한다. 조회 시에는 검색어 단어를 MAX_TERM_LENGTH로 자른 뒤 정확히 일치하는
+term만 찾으므로, 기본키 인덱스(table_identifier, term, record_id)를 record_id 순으로 읽다가
+바로 멈출 수 있다. 대신 레코드당 약 300개의 term이 저장되어 업로드와 저장 공간 비용이 크다.
+검색어 분리 규칙은 get_next_matching_record의 SQL과 같아야 한다.
+"""
+
+TERM_PATTERN = re.compile('[0-9a-z가-힣]+')
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 10
+STOP_TERMS = {'댓글'}
+
+
+def extract_terms(*texts) -> set:
+    terms = set()
+    for text in texts:
+        if not text:
+            continue
+        for word in TERM_PATTERN.findall(text.lower()):
+            word = word[:MAX_TERM_LENGTH]
+            for end in range(MIN_TERM_LENGTH, len(word) + 1):
+                terms.add(word[:end])
+    return terms - STOP_TERMS
+
+
+def index_record(table_name: str, record_id: int, *texts):
+    """
+    레코드의 색인을 현재 내용으로 교체한다.
+    업로드 시 같은 url의 내용이 덮어써질 수 있으므로, 기존 term을 지운 뒤 다시 넣는다.
+    """
+    # 레코드당 수백 개의 term이 생기므로 insert_many 대신 배열 하나를 unnest해서 한 번에 넣는다.
+    terms = list(extract_terms(*texts))
+    database = RecordKeyword._meta.database
+    with database.atomic():
+        database.execute_sql('DELETE FROM public.record_keywords WHERE table_identifier = %s AND record_id = %s',
+                             (table_name, record_id))
+        if terms:
+            database.execute_sql(
+                'INSERT INTO public.record_keywords (table_identifier, term, record_id) '
+                'SELECT %s, unnest(%s::text[]), %s ON CONFLICT DO NOTHING',
+                (table_name, terms, record_id))
+
+
+def build_keyword_index(TargetModel, batch_size: int = 1000):
+    """아직 색인되지 않은 레코드만 색인한다. (여러 번 실행해도 안전)"""
+    table_name = TargetModel._meta.table_name
+    already_indexed = (RecordKeyword
+                       .select()
+                       .where((RecordKeyword.table_identifier == table_name) &
+                              (RecordKeyword.record_id == TargetModel.id)))
+
+    last_id = 0
+    indexed = 0
+    while True:
+        records = list(TargetModel
+                       .select(TargetModel.id, TargetModel.title, TargetModel.content, TargetModel.comments)
+                       .where((TargetModel.id > last_id) & ~fn.EXISTS(already_indexed))
+                       .order_by(TargetModel.id)
+                       .limit(batch_size))
+        if not records:
+            break
+
+        with db.atomic():
+            for record in records:
+                index_record(table_name, record.id, record.title, record.content, record.comments)
+        last_id = records[-1].id
+        indexed += len(records)
+        print(f"  - {indexed} 레코드 색인 완료 (마지막 id: {last_id})")
+
+    return indexed
+
+
+def get_next_matching_record(table_name: str, keyword: str):
+    cursor = db.execute_sql('SELECT * FROM public.get_next_matching_record(%s, %s)', (table_name, keyword))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([c[0] for c in cursor.description], row))
+
+
+if __name__ == '__main__':
+    from article_uploader import MODEL_MAP
+
+    # ▼▼▼ 색인할 테이블명을 입력하세요. ▼▼▼
+    target_table = "beauty_promo_posts"
+
+    db.connect()
+    db.create_tables([RecordKeyword], safe=True)
+    try:
+        print(f"🔄 '{target_table}' 테이블 색인 시작...")
+        count = build_keyword_index(MODEL_MAP[target_table])
+        print(f"✨ '{target_table}' 테이블 색인 완료. ({count} 레코드)")
+    finally:
+        db.close()
@@ -71,11 +71,26 @@ serve(async (req) => {
             Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
         );
 
-        const { data: record, error: rpcError } = await supabaseAdmin.rpc('get_next_record', {
-            p_table_identifier: tableIdentifier
-        });
+        // 브랜드명/자격증 종류가 주어지면 해당 키워드가 포함된 레코드를 우선 사용합니다.
+        const keyword = topic === 'beautyPromoPost' ? brandName : topic === 'certificateReview' ? certificateType : undefined;
+        let record = null;
+        if (keyword) {
+            const { data: matched, error: matchError } = await supabaseAdmin.rpc('get_next_matching_record', {
+                p_table_identifier: tableIdentifier,
+                p_keyword: keyword
+            });
+            if (matchError) throw matchError;
+            record = matched;
+        }
+
+        if (!record || record.length === 0) {
+            const { data: next, error: rpcError } = await supabaseAdmin.rpc('get_next_record', {
+                p_table_identifier: tableIdentifier
+            });
+            if (rpcError) throw rpcError;
+            record = next;
+        }
 
-        if (rpcError) throw rpcError;
         if (!record || record.length === 0) {
             return new Response(JSON.stringify({ message: '더 이상 처리할 데이터가 없습니다.' }), {
                 headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 404
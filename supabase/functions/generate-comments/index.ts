@@ -56,13 +56,13 @@ serve(async (req) => {
 
         const { data: article, error } = await supabaseAdmin
             .from(sourceTable)
-            .select('comments')
+            .select('comments_excerpt')
             .eq('id', sourceArticleId)
             .single();
 
         if (error || !article) throw new Error('원본 게시글을 찾을 수 없습니다.');
 
-        const originalComments = article.comments;
+        const originalComments = article.comments_excerpt;
         const openai = new OpenAI({ apiKey: Deno.env.get('OPENAI_API_KEY') });
         const userPrompt = `[생성된 본문]\n${generatedContent}\n\n[참고할 원본 댓글 스타일]\n${originalComments}`;
 
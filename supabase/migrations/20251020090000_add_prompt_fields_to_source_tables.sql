@@ -0,0 +1,110 @@
+-- 1. 업로드 시점에 계산되는 프롬프트용 파생 컬럼을 추가합니다.
+ALTER TABLE public.articles
+    ADD COLUMN token_count integer,
+    ADD COLUMN comment_count integer,
+    ADD COLUMN content_excerpt text,
+    ADD COLUMN comments_excerpt text;
+
+ALTER TABLE public.certificate_reviews
+    ADD COLUMN token_count integer,
+    ADD COLUMN comment_count integer,
+    ADD COLUMN content_excerpt text,
+    ADD COLUMN comments_excerpt text;
+
+ALTER TABLE public.beauty_promo_posts
+    ADD COLUMN token_count integer,
+    ADD COLUMN comment_count integer,
+    ADD COLUMN content_excerpt text,
+    ADD COLUMN comments_excerpt text;
+
+ALTER TABLE public.olive_young_reviews
+    ADD COLUMN token_count integer,
+    ADD COLUMN comment_count integer,
+    ADD COLUMN content_excerpt text,
+    ADD COLUMN comments_excerpt text;
+
+COMMENT ON COLUMN public.articles.token_count IS 'Estimated token count of title, content and comments, computed at upload time.';
+COMMENT ON COLUMN public.articles.comment_count IS 'Number of comments, computed at upload time.';
+COMMENT ON COLUMN public.articles.content_excerpt IS 'Content truncated to the prompt token budget at upload time.';
+COMMENT ON COLUMN public.articles.comments_excerpt IS 'Leading comments that fit the prompt token budget at upload time.';
+
+COMMENT ON COLUMN public.certificate_reviews.token_count IS 'Estimated token count of title, content and comments, computed at upload time.';
+COMMENT ON COLUMN public.certificate_reviews.comment_count IS 'Number of comments, computed at upload time.';
+COMMENT ON COLUMN public.certificate_reviews.content_excerpt IS 'Content truncated to the prompt token budget at upload time.';
+COMMENT ON COLUMN public.certificate_reviews.comments_excerpt IS 'Leading comments that fit the prompt token budget at upload time.';
+
+COMMENT ON COLUMN public.beauty_promo_posts.token_count IS 'Estimated token count of title, content and comments, computed at upload time.';
+COMMENT ON COLUMN public.beauty_promo_posts.comment_count IS 'Number of comments, computed at upload time.';
+COMMENT ON COLUMN public.beauty_promo_posts.content_excerpt IS 'Content truncated to the prompt token budget at upload time.';
+COMMENT ON COLUMN public.beauty_promo_posts.comments_excerpt IS 'Leading comments that fit the prompt token budget at upload time.';
+
+COMMENT ON COLUMN public.olive_young_reviews.token_count IS 'Estimated token count of title, content and comments, computed at upload time.';
+COMMENT ON COLUMN public.olive_young_reviews.comment_count IS 'Number of comments, computed at upload time.';
+COMMENT ON COLUMN public.olive_young_reviews.content_excerpt IS 'Content truncated to the prompt token budget at upload time.';
+COMMENT ON COLUMN public.olive_young_reviews.comments_excerpt IS 'Leading comments that fit the prompt token budget at upload time.';
+
+-- 2. get_next_record가 원문 대신 발췌본을 반환하도록 변경합니다.
+-- 발췌본이 없는 기존 레코드는 원문을 그대로 반환합니다.
+DROP FUNCTION IF EXISTS public.get_next_record(text);
+
+CREATE OR REPLACE FUNCTION public.get_next_record(p_table_identifier TEXT)
+RETURNS TABLE(
+    id bigint,
+    created_at timestamp with time zone,
+    url text,
+    title text,
+    content text,
+    comments text,
+    token_count integer,
+    comment_count integer
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+last_id bigint;
+    next_record RECORD;
+    select_sql text;
+BEGIN
+SELECT last_processed_article_id INTO last_id
+FROM public.sequence_tracker
+WHERE table_identifier = p_table_identifier
+    FOR UPDATE;
+
+select_sql := format(
+    'SELECT id, created_at, url, title, '
+    || 'coalesce(content_excerpt, content) AS content, '
+    || 'coalesce(comments_excerpt, comments) AS comments, '
+    || 'token_count, comment_count '
+    || 'FROM public.%I WHERE id > $1 ORDER BY id ASC LIMIT 1',
+    p_table_identifier
+);
+
+EXECUTE select_sql INTO next_record USING last_id;
+
+IF next_record IS NULL THEN
+UPDATE public.sequence_tracker
+SET last_processed_article_id = 0
+WHERE table_identifier = p_table_identifier;
+
+EXECUTE select_sql INTO next_record USING 0::bigint;
+END IF;
+
+    IF next_record IS NOT NULL THEN
+UPDATE public.sequence_tracker
+SET last_processed_article_id = next_record.id
+WHERE table_identifier = p_table_identifier;
+
+RETURN QUERY SELECT
+            next_record.id,
+            next_record.created_at,
+            next_record.url,
+            next_record.title,
+            next_record.content,
+            next_record.comments,
+            next_record.token_count,
+            next_record.comment_count;
+END IF;
+
+    RETURN;
+END;
+$$;
@@ -0,0 +1,163 @@
+-- 1. 단어 -> 레코드 id 역색인 테이블 생성 (scripts/etl/top_posts_scraper/keyword_index.py가 채웁니다)
+-- 단어마다 2~10글자 접두어가 모두 저장되므로 조회는 term 완전 일치만 사용합니다.
+-- 기본키 인덱스에서 term이 같으면 record_id 순으로 정렬되어 있어 다음 레코드를 바로 찾을 수 있습니다.
+CREATE TABLE public.record_keywords (
+                                        table_identifier text NOT NULL,
+                                        term text NOT NULL,
+                                        record_id bigint NOT NULL,
+                                        CONSTRAINT record_keywords_pkey PRIMARY KEY (table_identifier, term, record_id)
+);
+
+COMMENT ON TABLE public.record_keywords IS 'title/content/comments 단어별 레코드 id 역색인';
+
+-- 레코드 단위로 색인을 지우거나(재색인) 색인 여부를 확인할 때 사용합니다.
+CREATE INDEX record_keywords_record_idx ON public.record_keywords (table_identifier, record_id);
+
+ALTER TABLE public.record_keywords ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable full access for service_role only"
+ON public.record_keywords
+FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+-- 2. 키워드별 마지막 처리 id 추적 테이블 생성 (sequence_tracker의 키워드 버전)
+CREATE TABLE public.keyword_sequence_tracker (
+                                                 table_identifier text NOT NULL,
+                                                 keyword text NOT NULL,
+                                                 last_processed_record_id bigint NOT NULL DEFAULT 0,
+                                                 CONSTRAINT keyword_sequence_tracker_pkey PRIMARY KEY (table_identifier, keyword)
+);
+
+COMMENT ON TABLE public.keyword_sequence_tracker IS '키워드 검색 시 마지막으로 처리된 레코드 ID 추적';
+
+ALTER TABLE public.keyword_sequence_tracker ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable full access for service_role only"
+ON public.keyword_sequence_tracker
+FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+-- 3. 키워드의 모든 단어와 매칭되는 다음 레코드를 반환합니다.
+-- 반환 형태는 get_next_record와 동일하며, 끝까지 읽으면 처음부터 다시 순환합니다.
+CREATE OR REPLACE FUNCTION public.get_next_matching_record(p_table_identifier TEXT, p_keyword TEXT)
+RETURNS TABLE(
+    id bigint,
+    created_at timestamp with time zone,
+    url text,
+    title text,
+    content text,
+    comments text,
+    token_count integer,
+    comment_count integer
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+terms text[];
+    normalized_keyword text;
+    last_id bigint;
+    next_id bigint;
+    next_record RECORD;
+BEGIN
+    -- 1. keyword_index.extract_terms와 같은 규칙으로 검색어를 단어로 나눕니다.
+    -- (2글자 이상, 10글자에서 자름, 불용어 제외)
+SELECT array_agg(q.term ORDER BY q.term) INTO terms
+FROM (
+    SELECT DISTINCT left(t, 10) AS term
+    FROM regexp_split_to_table(lower(p_keyword), '[^0-9a-z가-힣]+') AS t
+    WHERE length(t) >= 2
+) AS q
+WHERE q.term <> ALL (ARRAY['댓글']);
+
+IF terms IS NULL THEN
+        RETURN;
+END IF;
+
+    normalized_keyword := array_to_string(terms, ' ');
+
+    -- 색인이 가장 적은 단어를 먼저 두어 탐색의 기준으로 씁니다.
+    -- 단어마다 최대 1000건까지만 세므로 흔한 단어가 섞여 있어도 비용이 일정합니다.
+    IF cardinality(terms) > 1 THEN
+SELECT array_agg(q.term ORDER BY q.posting_count, length(q.term) DESC, q.term) INTO terms
+FROM (
+    SELECT u.term,
+           (SELECT count(*)
+            FROM (
+                SELECT 1
+                FROM public.record_keywords k
+                WHERE k.table_identifier = p_table_identifier
+                  AND k.term = u.term
+                LIMIT 1000
+            ) AS c) AS posting_count
+    FROM unnest(terms) AS u(term)
+) AS q;
+END IF;
+
+INSERT INTO public.keyword_sequence_tracker (table_identifier, keyword)
+VALUES (p_table_identifier, normalized_keyword)
+    ON CONFLICT DO NOTHING;
+
+SELECT last_processed_record_id INTO last_id
+FROM public.keyword_sequence_tracker
+WHERE table_identifier = p_table_identifier AND keyword = normalized_keyword
+    FOR UPDATE;
+
+-- 2. 가장 드문 단어의 색인을 record_id 순으로 읽으면서 나머지 단어도 가진 첫 레코드에서 멈춥니다.
+FOR i IN 1..2 LOOP
+SELECT k.record_id INTO next_id
+FROM public.record_keywords k
+WHERE k.table_identifier = p_table_identifier
+  AND k.term = terms[1]
+  AND k.record_id > last_id
+  AND NOT EXISTS (
+    SELECT 1
+    FROM unnest(terms[2:]) AS q(term)
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM public.record_keywords o
+        WHERE o.table_identifier = p_table_identifier
+          AND o.term = q.term
+          AND o.record_id = k.record_id
+    )
+)
+ORDER BY k.record_id ASC
+    LIMIT 1;
+
+EXIT WHEN next_id IS NOT NULL;
+
+        -- 3. 찾지 못했다면 처음부터 다시 찾습니다.
+        last_id := 0;
+END LOOP;
+
+    IF next_id IS NULL THEN
+        RETURN;
+END IF;
+
+UPDATE public.keyword_sequence_tracker
+SET last_processed_record_id = next_id
+WHERE table_identifier = p_table_identifier AND keyword = normalized_keyword;
+
+EXECUTE format(
+    'SELECT id, created_at, url, title, '
+    || 'coalesce(content_excerpt, content) AS content, '
+    || 'coalesce(comments_excerpt, comments) AS comments, '
+    || 'token_count, comment_count '
+    || 'FROM public.%I WHERE id = $1',
+    p_table_identifier
+) INTO next_record USING next_id;
+
+RETURN QUERY SELECT
+            next_record.id,
+            next_record.created_at,
+            next_record.url,
+            next_record.title,
+            next_record.content,
+            next_record.comments,
+            next_record.token_count,
+            next_record.comment_count;
+END;
+$$;